@@ -43,12 +43,31 @@ CREATE TABLE IF NOT EXISTS audit_log (
 CREATE INDEX IF NOT EXISTS idx_audit_ts ON audit_log(ts);
 CREATE INDEX IF NOT EXISTS idx_audit_actor ON audit_log(actor_agent_id);
 
+-- audit_log is split into INNERI_AUDIT_CHAINS independent hash chains (agents sharded by
+-- hash of agent_id); prev_hash links rows within one chain. Pre-sharding rows are chain 0.
+ALTER TABLE audit_log ADD COLUMN IF NOT EXISTS chain_id INTEGER NOT NULL DEFAULT 0;
+CREATE INDEX IF NOT EXISTS idx_audit_chain ON audit_log(chain_id, id);
+
+-- current head of each audit chain; row-locked while appending
+CREATE TABLE IF NOT EXISTS audit_chain_tips (
+  chain_id INTEGER PRIMARY KEY,
+  last_id BIGINT,
+  row_hash TEXT
+);
+
 CREATE TABLE IF NOT EXISTS reputations (
   agent_id TEXT PRIMARY KEY REFERENCES agents(agent_id) ON DELETE CASCADE,
   score INTEGER NOT NULL DEFAULT 50,
   updated_at TIMESTAMPTZ NOT NULL DEFAULT now()
 );
 
+-- outstanding auth nonce per agent (single use, shared by all gateway workers)
+CREATE TABLE IF NOT EXISTS agent_nonces (
+  agent_id TEXT PRIMARY KEY REFERENCES agents(agent_id) ON DELETE CASCADE,
+  nonce TEXT NOT NULL,
+  expires_unix BIGINT NOT NULL
+);
+
 CREATE TABLE IF NOT EXISTS verifications (
   id BIGSERIAL PRIMARY KEY,
   agent_id TEXT NOT NULL REFERENCES agents(agent_id) ON DELETE CASCADE,
@@ -56,3 +75,35 @@ CREATE TABLE IF NOT EXISTS verifications (
   report JSONB NOT NULL,
   created_at TIMESTAMPTZ NOT NULL DEFAULT now()
 );
+
+-- continuous verification: per-agent 5 minute activity buckets folded from audit_log
+CREATE TABLE IF NOT EXISTS agent_activity (
+  agent_id TEXT NOT NULL,
+  bucket_start TIMESTAMPTZ NOT NULL,
+  calls INTEGER NOT NULL DEFAULT 0,
+  denies INTEGER NOT NULL DEFAULT 0,
+  args_invalid INTEGER NOT NULL DEFAULT 0,
+  sandboxed INTEGER NOT NULL DEFAULT 0,
+  tool_calls INTEGER NOT NULL DEFAULT 0,
+  tool_errors INTEGER NOT NULL DEFAULT 0,
+  PRIMARY KEY (agent_id, bucket_start)
+);
+
+CREATE INDEX IF NOT EXISTS idx_agent_activity_bucket ON agent_activity(bucket_start);
+
+-- last audit_log id folded per audit chain (ids commit in order within a chain)
+CREATE TABLE IF NOT EXISTS verification_cursors (
+  chain_id INTEGER PRIMARY KEY,
+  last_audit_id BIGINT NOT NULL DEFAULT 0,
+  updated_at TIMESTAMPTZ NOT NULL DEFAULT now()
+);
+
+-- agents enrolled in continuous verification
+CREATE TABLE IF NOT EXISTS verification_schedule (
+  agent_id TEXT PRIMARY KEY REFERENCES agents(agent_id) ON DELETE CASCADE,
+  shard_key INTEGER NOT NULL,
+  last_scan_at TIMESTAMPTZ,
+  next_scan_at TIMESTAMPTZ NOT NULL DEFAULT now()
+);
+
+CREATE INDEX IF NOT EXISTS idx_verification_schedule_due ON verification_schedule(next_scan_at);
@@ -1,16 +1,36 @@
 from typing import Any, Dict, Optional
 from sqlalchemy.orm import Session
 from sqlalchemy import select, desc
-from .models import AuditLog
+from sqlalchemy.dialects.postgresql import insert
+from .models import AuditLog, AuditChainTip
 from .security import canonical_json
+from .coordination import audit_chain_for
 import hashlib
 
 def _sha256_hex(s: str) -> str:
     return hashlib.sha256(s.encode("utf-8")).hexdigest()
 
+def _lock_chain_tip(db: Session, chain_id: int) -> AuditChainTip:
+    # Row lock on the tip serializes appends within one chain; other chains proceed in parallel.
+    q = select(AuditChainTip).where(AuditChainTip.chain_id == chain_id).with_for_update().execution_options(populate_existing=True)
+    tip = db.execute(q).scalar_one_or_none()
+    if tip is None:
+        # First append to this chain: continue from whatever rows it already has.
+        last = db.execute(
+            select(AuditLog).where(AuditLog.chain_id == chain_id).order_by(desc(AuditLog.id)).limit(1)
+        ).scalar_one_or_none()
+        db.execute(insert(AuditChainTip).values(
+            chain_id=chain_id,
+            last_id=last.id if last else None,
+            row_hash=last.row_hash if last else None,
+        ).on_conflict_do_nothing(index_elements=["chain_id"]))
+        tip = db.execute(q).scalar_one()
+    return tip
+
 def append_audit(db: Session, actor_agent_id: Optional[str], action: str, request_json: Dict[str, Any], result_json: Dict[str, Any]) -> Dict[str, Any]:
-    prev = db.execute(select(AuditLog).order_by(desc(AuditLog.id)).limit(1)).scalar_one_or_none()
-    prev_hash = prev.row_hash if prev else None
+    chain_id = audit_chain_for(actor_agent_id)
+    tip = _lock_chain_tip(db, chain_id)
+    prev_hash = tip.row_hash
 
     row_obj = {
         "actor_agent_id": actor_agent_id,
@@ -22,6 +42,7 @@ def append_audit(db: Session, actor_agent_id: Optional[str], action: str, reques
     row_hash = _sha256_hex(canonical_json(row_obj))
 
     rec = AuditLog(
+        chain_id=chain_id,
         actor_agent_id=actor_agent_id,
         action=action,
         request_json=request_json,
@@ -30,6 +51,9 @@ def append_audit(db: Session, actor_agent_id: Optional[str], action: str, reques
         row_hash=row_hash,
     )
     db.add(rec)
+    db.flush()
+    audit_id = rec.id
+    tip.last_id = audit_id
+    tip.row_hash = row_hash
     db.commit()
-    db.refresh(rec)
-    return {"audit_id": rec.id, "row_hash": row_hash, "prev_hash": prev_hash}
+    return {"audit_id": audit_id, "chain_id": chain_id, "row_hash": row_hash, "prev_hash": prev_hash}
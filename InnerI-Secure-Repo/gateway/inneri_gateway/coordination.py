@@ -0,0 +1,51 @@
+"""Cross-worker coordination state, kept in Postgres so gateway workers stay stateless.
+
+- agent -> shard mapping (audit chains, verifier shards)
+- single-use auth nonces
+"""
+from typing import Optional, Tuple
+import hashlib
+
+from sqlalchemy import delete, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from .config import settings
+from .models import AgentNonce
+from .security import generate_nonce, now_unix
+
+def shard_key(agent_id: str) -> int:
+    """Stable 31-bit key; `shard_key(a) % n` assigns agent `a` to one of n shards."""
+    return int.from_bytes(hashlib.sha256(agent_id.encode("utf-8")).digest()[:4], "big") & 0x7FFFFFFF
+
+def audit_chain_for(actor_agent_id: Optional[str]) -> int:
+    """Audit chain an actor's rows are appended to. Unattributed rows go to chain 0."""
+    if not actor_agent_id or settings.audit_chains <= 1:
+        return 0
+    return shard_key(actor_agent_id) % settings.audit_chains
+
+def issue_nonce(db: Session, agent_id: str, ttl_seconds: int = 120) -> Tuple[str, int]:
+    """Replace the agent's outstanding nonce with a fresh one."""
+    nonce = generate_nonce()
+    exp = now_unix() + ttl_seconds
+    stmt = insert(AgentNonce).values(agent_id=agent_id, nonce=nonce, expires_unix=exp)
+    db.execute(stmt.on_conflict_do_update(
+        index_elements=["agent_id"],
+        set_={"nonce": stmt.excluded.nonce, "expires_unix": stmt.excluded.expires_unix},
+    ))
+    db.commit()
+    return nonce, exp
+
+def nonce_is_valid(db: Session, agent_id: str, nonce: str) -> bool:
+    entry = db.execute(select(AgentNonce).where(AgentNonce.agent_id == agent_id)).scalar_one_or_none()
+    return entry is not None and entry.nonce == nonce and entry.expires_unix >= now_unix()
+
+def consume_nonce(db: Session, agent_id: str, nonce: str) -> bool:
+    """Atomically use up a nonce; False if another worker already consumed it or it expired."""
+    consumed = db.execute(
+        delete(AgentNonce)
+        .where(AgentNonce.agent_id == agent_id, AgentNonce.nonce == nonce, AgentNonce.expires_unix >= now_unix())
+        .returning(AgentNonce.agent_id)
+    ).scalar_one_or_none()
+    db.commit()
+    return consumed is not None
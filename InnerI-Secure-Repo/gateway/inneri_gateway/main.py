@@ -2,27 +2,28 @@ from fastapi import FastAPI, Depends, HTTPException
 from sqlalchemy.orm import Session
 from sqlalchemy import select
 from jsonschema import validate, ValidationError
-from typing import Any, Dict, Optional
 import time
 
 from .db import get_db
 from .models import Agent, AgentKey, Tool, Reputation, Verification
 from .schemas import (
     AgentRegisterRequest, AgentNonceResponse, AgentAuthRequest,
-    SecureCallRequest, VerifyAgentRequest
+    SecureCallRequest, VerifyAgentRequest, ReceiptVerifyRequest
 )
-from .security import generate_nonce, now_unix, verify_agent_signature, sign_receipt, canonical_json
+from .security import verify_agent_signature, sign_receipt, verify_receipt, canonical_json
 from .jwt_auth import issue_jwt, require_auth
 from .secrets_vault import VaultClient
 from .policy import opa_decide
 from .tools_runtime import run_tool
 from .audit import append_audit
+from .coordination import issue_nonce, nonce_is_valid, consume_nonce
+from .verifier import enroll_agent, window_stats
+from .wire import WireResponse, WireRoute
 from .config import settings
 
-app = FastAPI(title="Inner I Gateway", version="0.1.0")
-
-# In-memory nonce store for MVP; replace with Redis in prod
-_NONCES: Dict[str, Dict[str, Any]] = {}
+app = FastAPI(title="Inner I Gateway", version="0.1.0", default_response_class=WireResponse)
+# Content negotiation (JSON/MessagePack/CBOR, gzip/zstd); must be set before routes are declared
+app.router.route_class = WireRoute
 
 def _get_agent(db: Session, agent_id: str) -> Agent:
     agent = db.get(Agent, agent_id)
@@ -56,23 +57,25 @@ def register_agent(req: AgentRegisterRequest, db: Session = Depends(get_db)):
 @app.get("/v1/agents/{agent_id}/nonce", response_model=AgentNonceResponse)
 def get_nonce(agent_id: str, db: Session = Depends(get_db)):
     _get_agent(db, agent_id)
-    nonce = generate_nonce()
-    exp = now_unix() + 120
-    _NONCES[agent_id] = {"nonce": nonce, "exp": exp}
+    # Stored in Postgres so any worker can verify it
+    nonce, exp = issue_nonce(db, agent_id, ttl_seconds=120)
     return AgentNonceResponse(agent_id=agent_id, nonce=nonce, expires_unix=exp)
 
 @app.post("/v1/agents/auth")
 def agent_auth(req: AgentAuthRequest, db: Session = Depends(get_db)):
     agent = _get_agent(db, req.agent_id)
     key = _get_agent_key(db, req.agent_id)
-    entry = _NONCES.get(req.agent_id)
-    if not entry or entry["nonce"] != req.nonce or entry["exp"] < now_unix():
+    if not nonce_is_valid(db, req.agent_id, req.nonce):
         raise HTTPException(status_code=401, detail="invalid_or_expired_nonce")
 
     message = canonical_json({"agent_id": req.agent_id, "nonce": req.nonce}).encode("utf-8")
     if not verify_agent_signature(key.public_key_ed25519, message, req.signature_b64url):
         raise HTTPException(status_code=401, detail="bad_signature")
 
+    # Single use: a concurrent replay on another worker loses this race
+    if not consume_nonce(db, req.agent_id, req.nonce):
+        raise HTTPException(status_code=401, detail="invalid_or_expired_nonce")
+
     # Issue short-lived JWT (portable identity) for subsequent calls.
     jwt_token = issue_jwt({
         "sub": req.agent_id,
@@ -129,7 +132,8 @@ def secure_call(req: SecureCallRequest, db: Session = Depends(get_db), token_cla
     })
 
     if not decision.get("allow", False):
-        append_audit(db, req.agent_id, "secure_call.deny", req.model_dump(), {"decision": decision})
+        # risk_tier lets the verifier tell denies it caused itself from agent behaviour
+        append_audit(db, req.agent_id, "secure_call.deny", req.model_dump(), {"decision": decision, "risk_tier": agent.risk_tier})
         raise HTTPException(status_code=403, detail={"denied": True, "decision": decision})
 
     mode = decision.get("mode", "normal")
@@ -183,6 +187,7 @@ def secure_call(req: SecureCallRequest, db: Session = Depends(get_db), token_cla
 
     receipt = {
         "ts_unix": int(time.time()),
+        "kid": settings.receipt_key_id,
         "agent_id": req.agent_id,
         "intent": req.intent,
         "mode": mode,
@@ -227,6 +232,11 @@ def verify_agent(req: VerifyAgentRequest, db: Session = Depends(get_db), token_c
     if level not in ("basic", "technical", "performance", "continuous"):
         raise HTTPException(status_code=400, detail="invalid_verification_level")
 
+    # Continuous: enroll in the background verifier, which owns risk_tier from here on
+    if level == "continuous":
+        enroll_agent(db, req.agent_id)
+        report["window"] = window_stats(db, req.agent_id)
+
     # Upgrade agent verification_level for demo
     agent.verification_level = "basic" if level == "basic" else "full"
     db.add(agent)
@@ -234,12 +244,17 @@ def verify_agent(req: VerifyAgentRequest, db: Session = Depends(get_db), token_c
     db.add(v)
     db.commit()
 
-    receipt = {"agent_id": req.agent_id, "level": level, "ts_unix": int(time.time())}
+    receipt = {"agent_id": req.agent_id, "level": level, "ts_unix": int(time.time()), "kid": settings.receipt_key_id}
     receipt["signature"] = sign_receipt(receipt, settings.receipt_signing_key)
 
     append_audit(db, req.agent_id, "agent.verify", req.model_dump(), {"report": report, "receipt": receipt})
     return {"ok": True, "report": report, "receipt": receipt}
 
+@app.post("/v1/receipts/verify")
+def verify_receipt_endpoint(req: ReceiptVerifyRequest, token_claims: dict = Depends(require_auth)):
+    # Any worker/node holding the same keyring can verify any other's receipts
+    return {"valid": verify_receipt(req.receipt, settings.receipt_keyring()), "kid": req.receipt.get("kid", "default")}
+
 @app.get("/v1/reputation/{agent_id}")
 def get_reputation(agent_id: str, db: Session = Depends(get_db), token_claims: dict = Depends(require_auth)):
     _get_agent(db, agent_id)
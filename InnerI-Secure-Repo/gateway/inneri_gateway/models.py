@@ -34,6 +34,7 @@ class Tool(Base):
 class AuditLog(Base):
     __tablename__ = "audit_log"
     id: Mapped[int] = mapped_column(BigInteger, primary_key=True)
+    chain_id: Mapped[int] = mapped_column(Integer, default=0)
     ts: Mapped[str] = mapped_column(DateTime(timezone=True), server_default=func.now())
     actor_agent_id: Mapped[str] = mapped_column(Text, nullable=True)
     action: Mapped[str] = mapped_column(Text)
@@ -55,3 +56,39 @@ class Verification(Base):
     level: Mapped[str] = mapped_column(Text)
     report: Mapped[dict] = mapped_column(JSON)
     created_at: Mapped[str] = mapped_column(DateTime(timezone=True), server_default=func.now())
+
+class AgentActivity(Base):
+    __tablename__ = "agent_activity"
+    agent_id: Mapped[str] = mapped_column(Text, primary_key=True)
+    bucket_start: Mapped[str] = mapped_column(DateTime(timezone=True), primary_key=True)
+    calls: Mapped[int] = mapped_column(Integer, default=0)
+    denies: Mapped[int] = mapped_column(Integer, default=0)
+    args_invalid: Mapped[int] = mapped_column(Integer, default=0)
+    sandboxed: Mapped[int] = mapped_column(Integer, default=0)
+    tool_calls: Mapped[int] = mapped_column(Integer, default=0)
+    tool_errors: Mapped[int] = mapped_column(Integer, default=0)
+
+class VerificationCursor(Base):
+    __tablename__ = "verification_cursors"
+    chain_id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    last_audit_id: Mapped[int] = mapped_column(BigInteger, default=0)
+    updated_at: Mapped[str] = mapped_column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+class VerificationSchedule(Base):
+    __tablename__ = "verification_schedule"
+    agent_id: Mapped[str] = mapped_column(Text, ForeignKey("agents.agent_id", ondelete="CASCADE"), primary_key=True)
+    shard_key: Mapped[int] = mapped_column(Integer)
+    last_scan_at: Mapped[str] = mapped_column(DateTime(timezone=True), nullable=True)
+    next_scan_at: Mapped[str] = mapped_column(DateTime(timezone=True), server_default=func.now())
+
+class AuditChainTip(Base):
+    __tablename__ = "audit_chain_tips"
+    chain_id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    last_id: Mapped[int] = mapped_column(BigInteger, nullable=True)
+    row_hash: Mapped[str] = mapped_column(Text, nullable=True)
+
+class AgentNonce(Base):
+    __tablename__ = "agent_nonces"
+    agent_id: Mapped[str] = mapped_column(Text, ForeignKey("agents.agent_id", ondelete="CASCADE"), primary_key=True)
+    nonce: Mapped[str] = mapped_column(Text)
+    expires_unix: Mapped[int] = mapped_column(BigInteger)
@@ -32,3 +32,6 @@ class VerifyAgentRequest(BaseModel):
     agent_id: str
     level: str = Field(default="basic")  # basic|technical|performance|continuous
     notes: Optional[str] = None
+
+class ReceiptVerifyRequest(BaseModel):
+    receipt: Dict[str, Any]
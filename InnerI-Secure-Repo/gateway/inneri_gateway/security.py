@@ -18,6 +18,17 @@ def sign_receipt(receipt: Dict[str, Any], signing_key: str) -> str:
     mac = hmac.new(signing_key.encode("utf-8"), canonical_json(receipt).encode("utf-8"), hashlib.sha256).digest()
     return b64url(mac)
 
+def verify_receipt(receipt: Dict[str, Any], keyring: Dict[str, str]) -> bool:
+    signature = receipt.get("signature")
+    if not isinstance(signature, str):
+        return False
+    body = {k: v for k, v in receipt.items() if k != "signature"}
+    # Receipts issued before key ids existed carry no kid
+    key = keyring.get(body.get("kid", "default"))
+    if key is None:
+        return False
+    return hmac.compare_digest(sign_receipt(body, key), signature)
+
 def verify_agent_signature(public_key_pem: str, message: bytes, signature_b64: str) -> bool:
     try:
         pub = serialization.load_pem_public_key(public_key_pem.encode("utf-8"))
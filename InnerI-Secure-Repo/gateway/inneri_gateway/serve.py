@@ -0,0 +1,55 @@
+"""Multi-worker launcher.
+
+Workers share no in-process state (nonces, audit chain tips and agent state
+live in Postgres), so any number can run side by side, on one or many nodes.
+
+Run: python -m inneri_gateway.serve [--workers N]
+"""
+import argparse
+import logging
+import os
+
+import uvicorn
+from sqlalchemy import create_engine, text
+
+from .config import settings
+
+log = logging.getLogger("inneri.serve")
+
+def _cpu_count() -> int:
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+def _db_connection_budget() -> int:
+    """Connections this node may open: Postgres max_connections minus a reserve."""
+    engine = create_engine(settings.db_dsn, pool_pre_ping=True, future=True)
+    try:
+        with engine.connect() as conn:
+            max_connections = int(conn.execute(text("SHOW max_connections")).scalar_one())
+    except Exception as e:
+        log.warning("could not read max_connections (%s); sizing from CPUs only", type(e).__name__)
+        return 1 << 30
+    finally:
+        engine.dispose()
+    return max_connections - settings.db_reserved_connections
+
+def auto_workers() -> int:
+    """One worker per usable CPU, capped so every worker can fill its DB pool."""
+    per_worker = settings.db_pool_size + settings.db_max_overflow
+    return max(1, min(_cpu_count(), _db_connection_budget() // per_worker))
+
+def main():
+    p = argparse.ArgumentParser(prog="python -m inneri_gateway.serve")
+    p.add_argument("--host", default="0.0.0.0")
+    p.add_argument("--port", type=int, default=8080)
+    p.add_argument("--workers", type=int, default=settings.workers, help="0 = auto-tune")
+    args = p.parse_args()
+    logging.basicConfig(level=settings.log_level.upper())
+
+    workers = args.workers or auto_workers()
+    log.info("starting %d gateway worker(s), %d audit chain(s)", workers, settings.audit_chains)
+    uvicorn.run("inneri_gateway.main:app", host=args.host, port=args.port, workers=workers, log_level=settings.log_level)
+
+if __name__ == "__main__":
+    main()
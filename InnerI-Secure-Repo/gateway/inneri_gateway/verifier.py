@@ -0,0 +1,273 @@
+"""Continuous verification engine.
+
+Folds new audit_log rows into per-agent activity buckets (incremental, cursor
+based — never a full-table scan), then rescans enrolled agents in order of
+staleness and risk and recomputes their risk tier from windowed rates.
+
+Run: python -m inneri_gateway.verifier --workers 4
+"""
+from typing import Any, Dict, List, Optional, Tuple
+import argparse
+import logging
+import multiprocessing
+import time
+
+from sqlalchemy import create_engine, select, text
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session, sessionmaker
+
+from .audit import append_audit
+from .config import settings
+from .coordination import shard_key
+from .models import Agent, AgentActivity, Verification, VerificationCursor, VerificationSchedule
+
+log = logging.getLogger("inneri.verifier")
+
+BUCKET_SECONDS = 300
+
+# Rescan interval per risk tier: riskier agents are looked at more often.
+SCAN_INTERVAL_SECONDS = {"high": 60, "med": 300, "low": 1800}
+
+# Fraction thresholds over the window; first tier whose limits are hit wins.
+TIER_THRESHOLDS = {
+    "high": {"deny_rate": 0.5, "args_invalid_rate": 0.25, "tool_error_rate": 0.5},
+    "med": {"deny_rate": 0.2, "args_invalid_rate": 0.1, "sandbox_rate": 0.5, "tool_error_rate": 0.2},
+}
+
+# Narrow projection of one chain's new audit rows; heavy JSON stays in Postgres.
+_NEW_EVENTS_SQL = text("""
+SELECT id, actor_agent_id, action,
+       to_timestamp(floor(extract(epoch FROM ts) / :bucket) * :bucket) AS bucket_start,
+       result_json->>'mode' AS mode,
+       result_json->>'risk_tier' AS risk_tier,
+       CASE WHEN action = 'secure_call.run' THEN
+         (SELECT count(*) FROM jsonb_array_elements(result_json->'outputs') o WHERE NOT o ? 'blocked')
+       ELSE 0 END AS tool_calls,
+       CASE WHEN action = 'secure_call.run' THEN
+         (SELECT count(*) FROM jsonb_array_elements(result_json->'outputs') o WHERE o ? 'error')
+       ELSE 0 END AS tool_errors
+FROM audit_log
+WHERE chain_id = :chain_id AND id > :after
+ORDER BY id
+LIMIT :limit
+""")
+
+_COUNTERS = ("calls", "denies", "args_invalid", "sandboxed", "tool_calls", "tool_errors")
+
+# policy.rego denies every call from these tiers; such denies say nothing new about the agent.
+_TIER_DENIED = ("high",)
+
+def enroll_agent(db: Session, agent_id: str) -> None:
+    """Put an agent on the continuous schedule (idempotent); first scan is due now."""
+    db.execute(insert(VerificationSchedule).values(
+        agent_id=agent_id, shard_key=shard_key(agent_id),
+    ).on_conflict_do_nothing(index_elements=["agent_id"]))
+
+def _fold_event(row: Any) -> Optional[Dict[str, int]]:
+    if row.action == "secure_call.deny":
+        if row.risk_tier in _TIER_DENIED:
+            return None
+        return {"calls": 1, "denies": 1}
+    if row.action == "tool.args_invalid":
+        return {"calls": 1, "args_invalid": 1}
+    if row.action == "secure_call.run":
+        return {
+            "calls": 1,
+            "sandboxed": 1 if row.mode == "sandbox" else 0,
+            "tool_calls": int(row.tool_calls),
+            "tool_errors": int(row.tool_errors),
+        }
+    return None
+
+def chains_for_shard(shard: int, num_shards: int) -> List[int]:
+    return [c for c in range(max(1, settings.audit_chains)) if c % num_shards == shard]
+
+def ingest(db: Session, chain_id: int, batch_size: Optional[int] = None) -> int:
+    """Fold the next batch of one audit chain's rows into agent_activity.
+
+    Appends to a chain hold the chain tip lock from insert to commit, so a
+    chain's ids become visible in order and `last_audit_id` never skips a row
+    that commits later. Cursor, buckets and schedule bumps commit together, so
+    each row is folded exactly once. Returns the number of audit rows consumed.
+    """
+    cursor = db.execute(
+        select(VerificationCursor).where(VerificationCursor.chain_id == chain_id).with_for_update()
+    ).scalar_one_or_none()
+    if cursor is None:
+        # Chain never folded before: backfill only the current window.
+        start = db.execute(text(
+            "SELECT coalesce("
+            "(SELECT min(id) - 1 FROM audit_log WHERE chain_id = :chain_id AND ts >= now() - make_interval(secs => :window)), "
+            "(SELECT max(id) FROM audit_log WHERE chain_id = :chain_id), 0)"
+        ), {"chain_id": chain_id, "window": settings.verifier_window_seconds}).scalar_one()
+        db.execute(insert(VerificationCursor).values(
+            chain_id=chain_id, last_audit_id=start,
+        ).on_conflict_do_nothing(index_elements=["chain_id"]))
+        db.commit()
+        return 0
+
+    rows = db.execute(_NEW_EVENTS_SQL, {
+        "chain_id": chain_id,
+        "after": cursor.last_audit_id,
+        "bucket": BUCKET_SECONDS,
+        "limit": batch_size or settings.verifier_batch_size,
+    }).all()
+    if not rows:
+        db.rollback()
+        return 0
+
+    buckets: Dict[Tuple[str, Any], Dict[str, int]] = {}
+    for row in rows:
+        if not row.actor_agent_id:
+            continue
+        delta = _fold_event(row)
+        if not delta:
+            continue
+        acc = buckets.setdefault((row.actor_agent_id, row.bucket_start), dict.fromkeys(_COUNTERS, 0))
+        for k, v in delta.items():
+            acc[k] += v
+
+    if buckets:
+        stmt = insert(AgentActivity).values([
+            {"agent_id": agent_id, "bucket_start": bucket_start, **counts}
+            for (agent_id, bucket_start), counts in buckets.items()
+        ])
+        db.execute(stmt.on_conflict_do_update(
+            index_elements=["agent_id", "bucket_start"],
+            set_={k: getattr(AgentActivity, k) + getattr(stmt.excluded, k) for k in _COUNTERS},
+        ))
+        # Fresh activity pulls an enrolled agent's next scan forward.
+        db.execute(text(
+            "UPDATE verification_schedule SET next_scan_at = least(next_scan_at, now() + make_interval(secs => :debounce)) "
+            "WHERE agent_id = ANY(:ids)"
+        ), {"debounce": settings.verifier_debounce_seconds, "ids": sorted({a for a, _ in buckets})})
+
+    cursor.last_audit_id = rows[-1].id
+    db.commit()
+    return len(rows)
+
+def window_stats(db: Session, agent_id: str, window_seconds: Optional[int] = None) -> Dict[str, Any]:
+    window_seconds = window_seconds or settings.verifier_window_seconds
+    sums = db.execute(text(
+        "SELECT " + ", ".join(f"coalesce(sum({k}), 0) AS {k}" for k in _COUNTERS) +
+        " FROM agent_activity WHERE agent_id = :agent_id AND bucket_start >= now() - make_interval(secs => :window)"
+    ), {"agent_id": agent_id, "window": window_seconds}).one()._asdict()
+    counts = {k: int(v) for k, v in sums.items()}
+    calls, tool_calls = counts["calls"], counts["tool_calls"]
+    return {
+        "window_seconds": window_seconds,
+        **counts,
+        "deny_rate": counts["denies"] / calls if calls else 0.0,
+        "args_invalid_rate": counts["args_invalid"] / calls if calls else 0.0,
+        "sandbox_rate": counts["sandboxed"] / calls if calls else 0.0,
+        "tool_error_rate": counts["tool_errors"] / tool_calls if tool_calls else 0.0,
+    }
+
+def risk_tier_for(stats: Dict[str, Any], current: str, raised_by_verifier: bool = False) -> str:
+    # Too little evidence: keep the current tier. A "high" agent is denied outright and
+    # cannot produce evidence, so if the verifier raised it, it drops to "med" once the
+    # events that raised it have aged out of the window. An operator-set "high" stays.
+    if stats["calls"] < settings.verifier_min_calls:
+        return "med" if current == "high" and raised_by_verifier else current
+    for tier in ("high", "med"):
+        if any(stats[k] >= limit for k, limit in TIER_THRESHOLDS[tier].items()):
+            return tier
+    return "low"
+
+def invalidate_agent_caches(db: Session, agent_id: str) -> None:
+    """Tell listeners (gateway workers, OPA data sync, ...) that agent state changed."""
+    db.execute(text("SELECT pg_notify('inneri_agent_changed', :agent_id)"), {"agent_id": agent_id})
+
+def _raised_by_verifier(db: Session, agent_id: str) -> bool:
+    """Whether the agent's latest continuous verification row is the verifier setting "high"."""
+    report = db.execute(
+        select(Verification.report)
+        .where(Verification.agent_id == agent_id, Verification.level == "continuous")
+        .order_by(Verification.id.desc()).limit(1)
+    ).scalar_one_or_none()
+    return bool(report) and report.get("source") == "verifier" and report.get("risk_tier") == "high"
+
+def scan_agent(db: Session, agent_id: str) -> Optional[Dict[str, Any]]:
+    """Recompute one agent's risk tier. Returns the report if the tier changed."""
+    agent = db.get(Agent, agent_id)
+    if agent is None:
+        return None
+    stats = window_stats(db, agent_id)
+    raised = agent.risk_tier == "high" and _raised_by_verifier(db, agent_id)
+    tier = risk_tier_for(stats, agent.risk_tier, raised_by_verifier=raised)
+    interval = SCAN_INTERVAL_SECONDS.get(tier, SCAN_INTERVAL_SECONDS["low"])
+    db.execute(text(
+        "UPDATE verification_schedule SET last_scan_at = now(), next_scan_at = now() + make_interval(secs => :interval) "
+        "WHERE agent_id = :agent_id"
+    ), {"interval": interval, "agent_id": agent_id})
+
+    if tier == agent.risk_tier:
+        db.commit()
+        return None
+
+    report = {"source": "verifier", "agent_id": agent_id, "risk_tier_before": agent.risk_tier, "risk_tier": tier, "window": stats}
+    agent.risk_tier = tier
+    db.add(agent)
+    db.add(Verification(agent_id=agent_id, level="continuous", report=report))
+    invalidate_agent_caches(db, agent_id)
+    db.commit()
+    append_audit(db, agent_id, "agent.risk_tier_change", {"agent_id": agent_id}, {"report": report})
+    return report
+
+def scan_due(db: Session, shard: int, num_shards: int, limit: int = 100) -> int:
+    """Scan this shard's most overdue agents (staleness x risk via next_scan_at).
+
+    An agent belongs to the shard that owns its audit chain.
+    """
+    due: List[str] = db.execute(text(
+        "SELECT agent_id FROM verification_schedule "
+        "WHERE (shard_key % :chains) % :n = :k AND next_scan_at <= now() "
+        "ORDER BY next_scan_at LIMIT :limit"
+    ), {"chains": max(1, settings.audit_chains), "n": num_shards, "k": shard, "limit": limit}).scalars().all()
+    db.rollback()
+    for agent_id in due:
+        scan_agent(db, agent_id)
+    return len(due)
+
+def prune(db: Session) -> None:
+    db.execute(text(
+        "DELETE FROM agent_activity WHERE bucket_start < now() - make_interval(secs => :keep)"
+    ), {"keep": settings.verifier_window_seconds + BUCKET_SECONDS})
+    db.commit()
+
+def run_worker(shard: int, num_shards: int) -> None:
+    # Each process owns its own engine; pooled connections must not cross a fork.
+    engine = create_engine(settings.db_dsn, pool_pre_ping=True, future=True)
+    Session_ = sessionmaker(bind=engine, autoflush=False, autocommit=False, future=True)
+    last_prune = 0.0
+    log.info("verifier shard %d/%d started", shard, num_shards)
+    while True:
+        with Session_() as db:
+            try:
+                consumed = max([ingest(db, chain_id) for chain_id in chains_for_shard(shard, num_shards)] or [0])
+                scanned = scan_due(db, shard, num_shards)
+                if shard == 0 and time.time() - last_prune > 3600:
+                    prune(db)
+                    last_prune = time.time()
+            except Exception:
+                log.exception("verifier shard %d/%d iteration failed", shard, num_shards)
+                db.rollback()
+                consumed = scanned = 0
+        # Busy shards keep draining; idle shards back off to the poll interval.
+        if consumed < settings.verifier_batch_size and not scanned:
+            time.sleep(settings.verifier_poll_seconds)
+
+def main():
+    p = argparse.ArgumentParser(prog="python -m inneri_gateway.verifier")
+    p.add_argument("--workers", type=int, default=settings.verifier_workers, help="Number of shard worker processes")
+    args = p.parse_args()
+    logging.basicConfig(level=settings.log_level.upper())
+
+    procs = [multiprocessing.Process(target=run_worker, args=(i, args.workers), name=f"verifier-{i}") for i in range(args.workers)]
+    for proc in procs:
+        proc.start()
+    for proc in procs:
+        proc.join()
+
+if __name__ == "__main__":
+    main()
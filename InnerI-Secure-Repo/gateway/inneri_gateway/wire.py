@@ -0,0 +1,268 @@
+"""Wire format + compression negotiation for gateway <-> SDK traffic.
+
+Bodies can be JSON (default), MessagePack or CBOR, optionally gzip/zstd
+compressed. This only changes transport: receipts are still signed over
+`canonical_json`, and every format decodes to the same plain dict/list/str/
+int/float/bool/None values, so a decoded receipt verifies unchanged.
+Binary request bodies outside that data model (bytes, ext types, tags,
+non-string keys) are rejected with 400. Responses that a binary format cannot
+carry, and error responses raised as HTTPException, are sent as JSON.
+"""
+from typing import Any, Callable, List, Optional, Tuple
+import contextvars
+import gzip
+import json
+import math
+import zlib
+
+from fastapi import HTTPException, Request, Response
+from fastapi.responses import JSONResponse
+from fastapi.routing import APIRoute
+from .config import settings
+
+try:
+    import msgpack
+except ImportError:  # optional
+    msgpack = None
+
+try:
+    import cbor2
+except ImportError:  # optional
+    cbor2 = None
+
+try:
+    import zstandard
+except ImportError:  # optional
+    zstandard = None
+
+MEDIA_TYPES = {
+    "json": "application/json",
+    "msgpack": "application/msgpack",
+    "cbor": "application/cbor",
+}
+_FORMAT_BY_MEDIA_TYPE = {
+    "application/json": "json",
+    "application/msgpack": "msgpack",
+    "application/x-msgpack": "msgpack",
+    "application/vnd.msgpack": "msgpack",
+    "application/cbor": "cbor",
+}
+
+def available_formats() -> List[str]:
+    return [f for f, mod in (("msgpack", msgpack), ("cbor", cbor2)) if mod is not None] + ["json"]
+
+def available_encodings() -> List[str]:
+    return (["zstd"] if zstandard is not None else []) + ["gzip"]
+
+def encode(obj: Any, fmt: str) -> bytes:
+    if fmt == "msgpack" and msgpack is not None:
+        return msgpack.packb(obj, use_bin_type=True)
+    if fmt == "cbor" and cbor2 is not None:
+        return cbor2.dumps(obj)
+    if fmt == "json":
+        return json.dumps(obj, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+    raise ValueError(f"unsupported wire format: {fmt}")
+
+def _reject_ext(code: int, data: bytes) -> Any:
+    raise ValueError(f"msgpack ext type {code} is not allowed")
+
+def _reject_tag(decoder: Any, tag: Any) -> Any:
+    raise ValueError(f"cbor tag {tag.tag} is not allowed")
+
+def _check_json_model(obj: Any) -> None:
+    """Only values JSON can carry may reach the endpoints (and canonical_json)."""
+    if obj is None or isinstance(obj, (bool, int, str)):
+        return
+    if isinstance(obj, float):
+        if not math.isfinite(obj):
+            raise ValueError("non-finite float")
+        return
+    if isinstance(obj, list):
+        for v in obj:
+            _check_json_model(v)
+        return
+    if isinstance(obj, dict):
+        for k, v in obj.items():
+            if not isinstance(k, str):
+                raise ValueError(f"non-string key: {type(k).__name__}")
+            _check_json_model(v)
+        return
+    raise ValueError(f"value of type {type(obj).__name__} is not JSON-compatible")
+
+def decode(data: bytes, fmt: str) -> Any:
+    if fmt == "msgpack" and msgpack is not None:
+        obj = msgpack.unpackb(data, raw=False, ext_hook=_reject_ext)
+        _check_json_model(obj)
+        return obj
+    if fmt == "cbor" and cbor2 is not None:
+        obj = cbor2.loads(data, tag_hook=_reject_tag)
+        _check_json_model(obj)
+        return obj
+    if fmt == "json":
+        return json.loads(data)
+    raise ValueError(f"unsupported wire format: {fmt}")
+
+def compress(data: bytes, encoding: str) -> bytes:
+    if encoding == "zstd" and zstandard is not None:
+        return zstandard.ZstdCompressor(level=3).compress(data)
+    if encoding == "gzip":
+        return gzip.compress(data, compresslevel=6)
+    raise ValueError(f"unsupported content encoding: {encoding}")
+
+def decompress(data: bytes, encoding: Optional[str], max_size: int) -> bytes:
+    """Undo Content-Encoding, refusing to inflate past `max_size` bytes.
+
+    Multi-member gzip and multi-frame zstd bodies are decoded in full; the cap
+    applies to the total.
+    """
+    encoding = (encoding or "identity").strip().lower()
+    if encoding == "identity":
+        out = data
+    elif encoding == "gzip":
+        out = b""
+        while data and len(out) <= max_size:
+            d = zlib.decompressobj(16 + zlib.MAX_WBITS)
+            out += d.decompress(data, max_size + 1 - len(out))
+            if len(out) <= max_size and not d.eof:
+                raise ValueError("truncated gzip body")
+            data = d.unused_data
+    elif encoding == "zstd" and zstandard is not None:
+        chunks: List[bytes] = []
+        size = 0
+        with zstandard.ZstdDecompressor().stream_reader(data, read_across_frames=True) as r:
+            while size <= max_size:
+                chunk = r.read(max_size + 1 - size)
+                if not chunk:
+                    break
+                chunks.append(chunk)
+                size += len(chunk)
+        out = b"".join(chunks)
+    else:
+        raise ValueError(f"unsupported content encoding: {encoding}")
+    if len(out) > max_size:
+        raise ValueError("body too large")
+    return out
+
+def _parse_header_list(value: Optional[str]) -> List[Tuple[str, float]]:
+    items = []
+    for i, part in enumerate((value or "").split(",")):
+        token, *params = [p.strip() for p in part.split(";")]
+        if not token:
+            continue
+        q = 1.0
+        for param in params:
+            if param.startswith("q="):
+                try:
+                    q = float(param[2:])
+                except ValueError:
+                    q = 0.0
+        items.append((token.lower(), q, -i))
+    # Highest q first; header order breaks ties.
+    return [(token, q) for token, q, _ in sorted(items, key=lambda t: (t[1], t[2]), reverse=True)]
+
+def negotiate_format(accept: Optional[str]) -> str:
+    available = available_formats()
+    for media_type, q in _parse_header_list(accept):
+        fmt = _FORMAT_BY_MEDIA_TYPE.get(media_type)
+        if q > 0 and fmt in available:
+            return fmt
+    return "json"
+
+def negotiate_encoding(accept_encoding: Optional[str]) -> Optional[str]:
+    available = available_encodings()
+    for encoding, q in _parse_header_list(accept_encoding):
+        if q > 0 and encoding in available:
+            return encoding
+    return None
+
+_response_format: contextvars.ContextVar[str] = contextvars.ContextVar("inneri_response_format", default="json")
+
+class WireResponse(JSONResponse):
+    """Default response class: renders in the format negotiated by WireRoute."""
+
+    def render(self, content: Any) -> bytes:
+        fmt = _response_format.get()
+        if fmt == "json":
+            return super().render(content)
+        try:
+            body = encode(content, fmt)
+        except (OverflowError, TypeError, ValueError):
+            # e.g. msgpack cannot pack ints beyond 64 bits (math_eval "2**70"); JSON can
+            return super().render(content)
+        self.media_type = MEDIA_TYPES[fmt]
+        return body
+
+class WireRequest(Request):
+    """Request whose body is decompressed and decoded per Content-Type/Content-Encoding.
+
+    Binary bodies are presented to FastAPI as already-parsed JSON, so endpoint
+    models validate exactly as they do for JSON clients.
+    """
+
+    def __init__(self, scope, receive):
+        content_type = ""
+        headers = []
+        for k, v in scope.get("headers", []):
+            if k == b"content-type":
+                content_type = v.decode("latin-1").split(";")[0].strip().lower()
+                continue
+            headers.append((k, v))
+        self.wire_format = _FORMAT_BY_MEDIA_TYPE.get(content_type)
+        if self.wire_format and self.wire_format not in available_formats():
+            raise HTTPException(status_code=415, detail="unsupported_content_type")
+        if self.wire_format:
+            headers.append((b"content-type", b"application/json"))
+        elif content_type:
+            headers.append((b"content-type", content_type.encode("latin-1")))
+        super().__init__({**scope, "headers": headers}, receive)
+
+    async def body(self) -> bytes:
+        if not hasattr(self, "_wire_body"):
+            encoding = (self.headers.get("content-encoding") or "identity").strip().lower()
+            if encoding != "identity" and encoding not in available_encodings():
+                raise HTTPException(status_code=415, detail="unsupported_content_encoding")
+            try:
+                self._wire_body = decompress(await super().body(), encoding, settings.max_body_bytes)
+            except Exception:
+                raise HTTPException(status_code=400, detail="invalid_or_oversized_body")
+        return self._wire_body
+
+    async def json(self) -> Any:
+        if not hasattr(self, "_json"):
+            body = await self.body()
+            if not self.wire_format or self.wire_format == "json":
+                # JSON decode errors propagate to FastAPI, which maps them as before.
+                self._json = decode(body, "json")
+            else:
+                try:
+                    self._json = decode(body, self.wire_format)
+                except Exception:
+                    raise HTTPException(status_code=400, detail="body_not_json_compatible")
+        return self._json
+
+def _compress_response(response: Response, accept_encoding: Optional[str]) -> Response:
+    response.headers["vary"] = "Accept, Accept-Encoding"
+    body = getattr(response, "body", None)
+    if not body or len(body) < settings.compress_min_bytes or "content-encoding" in response.headers:
+        return response
+    encoding = negotiate_encoding(accept_encoding)
+    if encoding:
+        response.body = compress(body, encoding)
+        response.headers["content-encoding"] = encoding
+        response.headers["content-length"] = str(len(response.body))
+    return response
+
+class WireRoute(APIRoute):
+    def get_route_handler(self) -> Callable:
+        original = super().get_route_handler()
+
+        async def handler(request: Request) -> Response:
+            request = WireRequest(request.scope, request.receive)
+            token = _response_format.set(negotiate_format(request.headers.get("accept")))
+            try:
+                response = await original(request)
+            finally:
+                _response_format.reset(token)
+            return _compress_response(response, request.headers.get("accept-encoding"))
+
+        return handler
@@ -0,0 +1,26 @@
+from inneri_gateway.config import Settings
+from inneri_gateway.security import sign_receipt, verify_receipt
+
+def _signed(receipt, key):
+    return {**receipt, "signature": sign_receipt(receipt, key)}
+
+def test_keyring_includes_active_and_extra_keys():
+    s = Settings(receipt_signing_key="new_key", receipt_key_id="k2", receipt_keys="k1:old_key, bad, k0:")
+    assert s.receipt_keyring() == {"k1": "old_key", "k2": "new_key"}
+
+def test_verify_by_kid_after_rotation():
+    keyring = Settings(receipt_signing_key="new_key", receipt_key_id="k2", receipt_keys="k1:old_key").receipt_keyring()
+    assert verify_receipt(_signed({"agent_id": "a", "kid": "k2"}, "new_key"), keyring)
+    assert verify_receipt(_signed({"agent_id": "a", "kid": "k1"}, "old_key"), keyring)
+    # Wrong key for the kid, unknown kid, tampered body
+    assert not verify_receipt(_signed({"agent_id": "a", "kid": "k1"}, "new_key"), keyring)
+    assert not verify_receipt(_signed({"agent_id": "a", "kid": "k9"}, "new_key"), keyring)
+    tampered = _signed({"agent_id": "a", "kid": "k2"}, "new_key")
+    tampered["agent_id"] = "b"
+    assert not verify_receipt(tampered, keyring)
+
+def test_receipts_without_kid_use_default():
+    receipt = _signed({"agent_id": "a"}, "legacy")
+    assert verify_receipt(receipt, {"default": "legacy"})
+    assert not verify_receipt(receipt, {"k2": "legacy"})
+    assert not verify_receipt({"agent_id": "a"}, {"default": "legacy"})
@@ -0,0 +1,46 @@
+from types import SimpleNamespace
+
+from inneri_gateway.config import settings
+from inneri_gateway.verifier import _fold_event, risk_tier_for
+
+def _stats(calls=0, denies=0, args_invalid=0, sandboxed=0, tool_calls=0, tool_errors=0):
+    return {
+        "calls": calls,
+        "deny_rate": denies / calls if calls else 0.0,
+        "args_invalid_rate": args_invalid / calls if calls else 0.0,
+        "sandbox_rate": sandboxed / calls if calls else 0.0,
+        "tool_error_rate": tool_errors / tool_calls if tool_calls else 0.0,
+    }
+
+def _row(action, risk_tier=None, mode=None, tool_calls=0, tool_errors=0):
+    return SimpleNamespace(action=action, risk_tier=risk_tier, mode=mode, tool_calls=tool_calls, tool_errors=tool_errors)
+
+def test_denies_promote_to_high():
+    n = settings.verifier_min_calls
+    assert risk_tier_for(_stats(calls=n, denies=n), "low") == "high"
+
+def test_verifier_raised_high_released_without_evidence():
+    # Denied outright while "high", so the window drains; agent must not stay "high".
+    assert risk_tier_for(_stats(calls=0), "high", raised_by_verifier=True) == "med"
+
+def test_operator_set_high_kept_without_evidence():
+    assert risk_tier_for(_stats(calls=0), "high") == "high"
+    assert risk_tier_for(_stats(calls=0), "high", raised_by_verifier=False) == "high"
+
+def test_probation_agent_demoted_to_low_on_clean_evidence():
+    n = settings.verifier_min_calls
+    assert risk_tier_for(_stats(calls=n, tool_calls=n), "med") == "low"
+
+def test_too_little_evidence_keeps_low_and_med():
+    assert risk_tier_for(_stats(calls=1, denies=1), "low") == "low"
+    assert risk_tier_for(_stats(calls=0), "med") == "med"
+
+def test_tier_caused_denies_are_not_counted():
+    assert _fold_event(_row("secure_call.deny", risk_tier="high")) is None
+    assert _fold_event(_row("secure_call.deny", risk_tier="low")) == {"calls": 1, "denies": 1}
+    # Rows audited before risk_tier was recorded still count.
+    assert _fold_event(_row("secure_call.deny")) == {"calls": 1, "denies": 1}
+
+def test_run_counts_sandbox_and_tool_errors():
+    delta = _fold_event(_row("secure_call.run", mode="sandbox", tool_calls=3, tool_errors=1))
+    assert delta == {"calls": 1, "sandboxed": 1, "tool_calls": 3, "tool_errors": 1}
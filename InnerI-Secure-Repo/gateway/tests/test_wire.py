@@ -0,0 +1,96 @@
+import datetime
+import gzip
+import json
+from typing import Any, Dict
+
+import cbor2
+import msgpack
+import pytest
+import zstandard
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from pydantic import BaseModel, Field
+
+from inneri_gateway.security import canonical_json
+from inneri_gateway.wire import WireResponse, WireRoute, decode, decompress
+
+app = FastAPI(default_response_class=WireResponse)
+app.router.route_class = WireRoute
+
+class _Call(BaseModel):
+    tool_id: str
+    args: Dict[str, Any] = Field(default_factory=dict)
+
+@app.post("/call")
+def _call(req: _Call):
+    # Mirrors secure_call: args end up in canonical_json (receipts, audit rows)
+    return {"tool_id": req.tool_id, "args_hash": canonical_json(req.args)}
+
+@app.get("/big")
+def _big():
+    return {"value": 2 ** 70}
+
+client = TestClient(app)
+
+def _post(body: bytes, content_type: str, accept: str = "application/json"):
+    return client.post("/call", content=body, headers={"Content-Type": content_type, "Accept": accept})
+
+def test_msgpack_and_cbor_roundtrip():
+    call = {"tool_id": "echo", "args": {"text": "hi", "n": 2 ** 40, "f": 1.5, "l": [None, True]}}
+    r = _post(msgpack.packb(call), "application/msgpack", accept="application/msgpack")
+    assert r.status_code == 200
+    assert r.headers["content-type"] == "application/msgpack"
+    assert msgpack.unpackb(r.content) == {"tool_id": "echo", "args_hash": canonical_json(call["args"])}
+    r = _post(cbor2.dumps(call), "application/cbor", accept="application/cbor")
+    assert r.status_code == 200
+    assert cbor2.loads(r.content)["args_hash"] == canonical_json(call["args"])
+
+@pytest.mark.parametrize("body,content_type", [
+    (msgpack.packb({"tool_id": "echo", "args": {"text": b"hi"}}, use_bin_type=True), "application/msgpack"),
+    (msgpack.packb({"tool_id": "echo", "args": {"t": msgpack.ExtType(5, b"x")}}), "application/msgpack"),
+    (msgpack.packb({"tool_id": "echo", "args": {1: "int key"}}, strict_types=False), "application/msgpack"),
+    (cbor2.dumps({"tool_id": "echo", "args": {"when": datetime.datetime(2026, 1, 1, tzinfo=datetime.timezone.utc)}}), "application/cbor"),
+    (cbor2.dumps({"tool_id": "echo", "args": {"text": b"hi"}}), "application/cbor"),
+    (cbor2.dumps({"tool_id": "echo", "args": {"t": cbor2.CBORTag(4242, "x")}}), "application/cbor"),
+    (cbor2.dumps({"tool_id": "echo", "args": {"nan": float("nan")}}), "application/cbor"),
+])
+def test_non_json_values_rejected_with_400(body, content_type):
+    r = _post(body, content_type)
+    assert r.status_code == 400
+    assert r.json() == {"detail": "body_not_json_compatible"}
+
+def test_decode_rejects_non_json_values():
+    with pytest.raises(ValueError):
+        decode(msgpack.packb({"a": b"bytes"}, use_bin_type=True), "msgpack")
+    with pytest.raises(ValueError):
+        decode(cbor2.dumps({"a": datetime.datetime(2026, 1, 1, tzinfo=datetime.timezone.utc)}), "cbor")
+    assert decode(cbor2.dumps({"a": 2 ** 70}), "cbor") == {"a": 2 ** 70}
+
+def test_unpackable_response_falls_back_to_json():
+    r = client.get("/big", headers={"Accept": "application/msgpack"})
+    assert r.status_code == 200
+    assert r.headers["content-type"] == "application/json"
+    assert json.loads(r.content) == {"value": 2 ** 70}
+    r = client.get("/big", headers={"Accept": "application/cbor"})
+    assert r.headers["content-type"] == "application/cbor"
+    assert cbor2.loads(r.content) == {"value": 2 ** 70}
+
+def test_multi_frame_and_multi_member_bodies_decoded_in_full():
+    body = json.dumps({"tool_id": "echo", "args": {"text": "x" * 100}}).encode()
+    head, tail = body[:20], body[20:]
+    for encoding, parts in (
+        ("zstd", zstandard.ZstdCompressor().compress(head) + zstandard.ZstdCompressor().compress(tail)),
+        ("gzip", gzip.compress(head) + gzip.compress(tail)),
+    ):
+        assert decompress(parts, encoding, 1024) == body
+        r = client.post("/call", content=parts, headers={"Content-Type": "application/json", "Content-Encoding": encoding})
+        assert r.status_code == 200
+        assert r.json()["tool_id"] == "echo"
+        # The cap covers all frames/members together
+        with pytest.raises(ValueError):
+            decompress(parts, encoding, len(body) - 1)
+
+def test_trailing_garbage_after_gzip_rejected():
+    r = client.post("/call", content=gzip.compress(b'{"tool_id":"echo"}') + b"junk",
+                    headers={"Content-Type": "application/json", "Content-Encoding": "gzip"})
+    assert r.status_code == 400
@@ -0,0 +1,84 @@
+"""Payload size and encode/decode time per wire format + compression.
+
+    pip install -e '.[wire]'
+    python benchmarks/wire_formats.py --outputs 50 --text-bytes 2000
+
+Uses a synthetic `secure_call` response (outputs + receipt + decision + audit)
+and checks that every format round-trips to the same `canonical_json`, i.e.
+that receipts still verify after decoding.
+"""
+import argparse
+import hashlib
+import random
+import statistics
+import time
+
+from inneri import wire
+from inneri.client import _canonical_json
+
+_WORDS = "agent tool policy sandbox receipt audit vault nonce token verify deny allow scope intent model prompt".split()
+
+def sample_response(n_outputs: int, text_bytes: int):
+    rng = random.Random(0)
+    outputs = []
+    for i in range(n_outputs):
+        if i % 3 == 0:
+            outputs.append({"tool_id": "echo", "output": {"text": " ".join(rng.choice(_WORDS) + str(rng.randrange(1000)) for _ in range(text_bytes // 9))}})
+        elif i % 3 == 1:
+            outputs.append({"tool_id": "math_eval", "output": {"value": i * 1.5}})
+        else:
+            outputs.append({"tool_id": "time_now", "output": {"utc": "2026-01-01T00:00:00.%06dZ" % i}})
+    decision = {"allow": True, "mode": "normal", "ttl_seconds": 120, "reasons": []}
+    receipt = {
+        "ts_unix": 1767225600,
+        "agent_id": "agent_demo",
+        "intent": "bench",
+        "mode": "normal",
+        "decision": decision,
+        "outputs_hash": hashlib.sha256(_canonical_json(outputs).encode("utf-8")).hexdigest(),
+        "signature": "x" * 43,
+    }
+    audit = {"audit_id": 123456, "row_hash": "a" * 64, "prev_hash": "b" * 64}
+    return {"outputs": outputs, "receipt": receipt, "audit": audit}
+
+def _median_ms(fn, repeat: int) -> float:
+    times = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        times.append((time.perf_counter() - t0) * 1000)
+    return statistics.median(times)
+
+def main():
+    p = argparse.ArgumentParser()
+    p.add_argument("--outputs", type=int, default=50, help="Tool outputs per response")
+    p.add_argument("--text-bytes", type=int, default=2000, help="Approx size of each echo output")
+    p.add_argument("--repeat", type=int, default=200)
+    args = p.parse_args()
+
+    obj = sample_response(args.outputs, args.text_bytes)
+    canonical = _canonical_json(obj)
+
+    print(f"{'format':<8} {'encoding':<9} {'bytes':>9} {'ratio':>6} {'encode ms':>10} {'decode ms':>10}")
+    baseline = None
+    for fmt in wire.FORMATS:
+        for encoding in (None,) + wire.ENCODINGS:
+            try:
+                wire.require(fmt, encoding)
+            except RuntimeError:
+                print(f"{fmt:<8} {encoding or '-':<9} {'(not installed)':>9}")
+                continue
+            if encoding:
+                enc = lambda: wire.compress(wire.encode(obj, fmt), encoding)
+                dec = lambda data: wire.decode(wire.decompress(data, encoding), fmt)
+            else:
+                enc = lambda: wire.encode(obj, fmt)
+                dec = lambda data: wire.decode(data, fmt)
+            data = enc()
+            assert _canonical_json(dec(data)) == canonical, f"{fmt}/{encoding} changed the canonical form"
+            baseline = baseline or len(data)
+            print(f"{fmt:<8} {encoding or '-':<9} {len(data):>9} {len(data) / baseline:>6.2f} "
+                  f"{_median_ms(enc, args.repeat):>10.3f} {_median_ms(lambda: dec(data), args.repeat):>10.3f}")
+
+if __name__ == "__main__":
+    main()
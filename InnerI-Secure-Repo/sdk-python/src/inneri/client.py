@@ -4,6 +4,10 @@ from typing import Any, Dict, List, Optional
 from cryptography.hazmat.primitives import serialization
 from cryptography.hazmat.primitives.asymmetric.ed25519 import Ed25519PrivateKey
 import base64
+from . import wire
+
+# Small bodies are not worth compressing
+_COMPRESS_MIN_BYTES = 1024
 
 def _b64url(data: bytes) -> str:
     return base64.urlsafe_b64encode(data).decode("utf-8").rstrip("=")
@@ -12,31 +16,48 @@ def _canonical_json(obj: Any) -> str:
     return json.dumps(obj, separators=(",", ":"), sort_keys=True, ensure_ascii=False)
 
 class InnerIClient:
-    def __init__(self, gateway_url: str):
+    def __init__(self, gateway_url: str, wire_format: str = "json", compression: Optional[str] = None):
+        """`wire_format`: json|msgpack|cbor; `compression`: None|gzip|zstd (applies both ways)."""
+        wire.require(wire_format, compression)
         self.gateway_url = gateway_url.rstrip("/")
+        self.wire_format = wire_format
+        self.compression = compression
+
+    def _request(self, method: str, path: str, body: Optional[Dict[str, Any]] = None, timeout: float = 10, headers: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
+        accept = wire.MEDIA_TYPES[self.wire_format]
+        if self.wire_format != "json":
+            # Error bodies (and older gateways) answer in JSON
+            accept += ", application/json;q=0.5"
+        hdrs = {"Accept": accept, "Accept-Encoding": self.compression or "identity", **(headers or {})}
+        data = None
+        if body is not None:
+            data = wire.encode(body, self.wire_format)
+            hdrs["Content-Type"] = wire.MEDIA_TYPES[self.wire_format]
+            if self.compression and len(data) >= _COMPRESS_MIN_BYTES:
+                data = wire.compress(data, self.compression)
+                hdrs["Content-Encoding"] = self.compression
+        with requests.request(method, f"{self.gateway_url}{path}", data=data, headers=hdrs, timeout=timeout, stream=True) as r:
+            r.raise_for_status()
+            raw = r.raw.read(decode_content=False)
+            content = wire.decompress(raw, r.headers.get("Content-Encoding"))
+            return wire.decode(content, wire.format_for(r.headers.get("Content-Type")))
 
     def register_agent(self, agent_id: str, display_name: str, public_key_pem: str) -> Dict[str, Any]:
-        r = requests.post(f"{self.gateway_url}/v1/agents/register", json={
+        return self._request("POST", "/v1/agents/register", {
             "agent_id": agent_id,
             "display_name": display_name,
             "public_key_ed25519_pem": public_key_pem,
-        }, timeout=10)
-        r.raise_for_status()
-        return r.json()
+        })
 
     def get_nonce(self, agent_id: str) -> Dict[str, Any]:
-        r = requests.get(f"{self.gateway_url}/v1/agents/{agent_id}/nonce", timeout=10)
-        r.raise_for_status()
-        return r.json()
+        return self._request("GET", f"/v1/agents/{agent_id}/nonce")
 
     def auth(self, agent_id: str, priv: Ed25519PrivateKey) -> Dict[str, Any]:
         n = self.get_nonce(agent_id)
         msg = _canonical_json({"agent_id": agent_id, "nonce": n["nonce"]}).encode("utf-8")
         sig = priv.sign(msg)
         payload = {"agent_id": agent_id, "nonce": n["nonce"], "signature_b64url": _b64url(sig)}
-        r = requests.post(f"{self.gateway_url}/v1/agents/auth", json=payload, timeout=10)
-        r.raise_for_status()
-        return r.json()
+        return self._request("POST", "/v1/agents/auth", payload)
 
     def secure_call(self, agent_id: str, intent: str, tools: List[Dict[str, Any]], data_scopes: List[str], bearer_token: str, model: Optional[str]=None, prompt: Optional[str]=None) -> Dict[str, Any]:
         body = {
@@ -47,9 +68,7 @@ class InnerIClient:
             "tools": tools,
             "data_scopes": data_scopes,
         }
-        r = requests.post(f"{self.gateway_url}/v1/secure_call", json=body, timeout=30, headers={"Authorization": f"Bearer {bearer_token}"})
-        r.raise_for_status()
-        return r.json()
+        return self._request("POST", "/v1/secure_call", body, timeout=30, headers={"Authorization": f"Bearer {bearer_token}"})
 
 def _load_priv(path: str) -> Ed25519PrivateKey:
     with open(path, "rb") as f:
@@ -72,10 +91,12 @@ def secure_agent_call(
     data_scopes: Optional[List[str]] = None,
     model: Optional[str] = None,
     prompt: Optional[str] = None,
+    wire_format: str = "json",
+    compression: Optional[str] = None,
 ) -> Dict[str, Any]:
     """One-liner call that authenticates + runs tools through Inner I."""
     data_scopes = data_scopes or ["public"]
-    client = InnerIClient(gateway_url=gateway_url)
+    client = InnerIClient(gateway_url=gateway_url, wire_format=wire_format, compression=compression)
     priv = _load_priv(agent_private_key_path)
     # auth handshake (nonce + signature)
     auth = client.auth(agent_id, priv)
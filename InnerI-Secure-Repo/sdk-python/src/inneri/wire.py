@@ -0,0 +1,85 @@
+"""Wire formats (JSON/MessagePack/CBOR) and compression (gzip/zstd) for gateway traffic.
+
+MessagePack, CBOR and zstd need the optional `inneri[wire]` extra. All formats
+decode to plain Python values, so `canonical_json` of a decoded receipt is the
+same string the gateway signed.
+"""
+from typing import Any, Optional
+import gzip
+import json
+
+try:
+    import msgpack
+except ImportError:  # optional
+    msgpack = None
+
+try:
+    import cbor2
+except ImportError:  # optional
+    cbor2 = None
+
+try:
+    import zstandard
+except ImportError:  # optional
+    zstandard = None
+
+FORMATS = ("json", "msgpack", "cbor")
+ENCODINGS = ("gzip", "zstd")
+
+MEDIA_TYPES = {
+    "json": "application/json",
+    "msgpack": "application/msgpack",
+    "cbor": "application/cbor",
+}
+_FORMAT_BY_MEDIA_TYPE = {
+    "application/json": "json",
+    "application/msgpack": "msgpack",
+    "application/x-msgpack": "msgpack",
+    "application/vnd.msgpack": "msgpack",
+    "application/cbor": "cbor",
+}
+
+def require(fmt: str = "json", encoding: Optional[str] = None) -> None:
+    """Raise early if a format/encoding was requested but its library is missing."""
+    if fmt not in FORMATS:
+        raise ValueError(f"unsupported wire format: {fmt}")
+    if encoding is not None and encoding not in ENCODINGS:
+        raise ValueError(f"unsupported content encoding: {encoding}")
+    missing = {"msgpack": msgpack is None, "cbor": cbor2 is None}.get(fmt) or (encoding == "zstd" and zstandard is None)
+    if missing:
+        raise RuntimeError(f"{fmt}/{encoding} support needs extra deps: pip install 'inneri[wire]'")
+
+def format_for(content_type: Optional[str]) -> str:
+    media_type = (content_type or "application/json").split(";")[0].strip().lower()
+    return _FORMAT_BY_MEDIA_TYPE.get(media_type, "json")
+
+def encode(obj: Any, fmt: str) -> bytes:
+    if fmt == "msgpack":
+        return msgpack.packb(obj, use_bin_type=True)
+    if fmt == "cbor":
+        return cbor2.dumps(obj)
+    return json.dumps(obj, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+def decode(data: bytes, fmt: str) -> Any:
+    if fmt == "msgpack":
+        return msgpack.unpackb(data, raw=False)
+    if fmt == "cbor":
+        return cbor2.loads(data)
+    return json.loads(data)
+
+def compress(data: bytes, encoding: str) -> bytes:
+    if encoding == "zstd":
+        return zstandard.ZstdCompressor(level=3).compress(data)
+    return gzip.compress(data, compresslevel=6)
+
+def decompress(data: bytes, encoding: Optional[str]) -> bytes:
+    encoding = (encoding or "identity").strip().lower()
+    if encoding == "zstd":
+        # A body may hold several zstd frames; gzip.decompress already reads every member
+        with zstandard.ZstdDecompressor().stream_reader(data, read_across_frames=True) as r:
+            return r.read()
+    if encoding == "gzip":
+        return gzip.decompress(data)
+    if encoding == "identity":
+        return data
+    raise ValueError(f"unsupported content encoding: {encoding}")
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# Round-trip tests run the gateway's own wire layer; the gateway is not a package.
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "gateway"))
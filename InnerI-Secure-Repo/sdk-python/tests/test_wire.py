@@ -0,0 +1,87 @@
+import threading
+import time
+from typing import Any, Dict
+
+import pytest
+
+from inneri import wire
+from inneri.client import InnerIClient
+
+fastapi = pytest.importorskip("fastapi")
+uvicorn = pytest.importorskip("uvicorn")
+gateway_wire = pytest.importorskip("inneri_gateway.wire")
+
+app = fastapi.FastAPI(default_response_class=gateway_wire.WireResponse)
+app.router.route_class = gateway_wire.WireRoute
+seen = []
+
+@app.middleware("http")
+async def _record(request, call_next):
+    response = await call_next(request)
+    seen.append((response.headers.get("content-type"), response.headers.get("content-encoding")))
+    return response
+
+@app.post("/echo")
+def _echo(body: Dict[str, Any], request: fastapi.Request):
+    return {"body": body, "content_encoding": request.headers.get("content-encoding")}
+
+@app.get("/status")
+def _status():
+    return {"ok": True, "text": "x" * 2000}
+
+@pytest.fixture(scope="module")
+def gateway_url():
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=0, log_level="warning"))
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    deadline = time.time() + 10
+    while not server.started:
+        if time.time() > deadline:
+            raise RuntimeError("test gateway did not start")
+        time.sleep(0.05)
+    port = server.servers[0].sockets[0].getsockname()[1]
+    yield f"http://127.0.0.1:{port}"
+    server.should_exit = True
+    thread.join(timeout=10)
+
+# Large enough that both sides compress
+BODY = {"agent_id": "a", "tools": [{"tool_id": "echo", "args": {"text": "hello " * 400, "n": 2 ** 40, "f": 1.5}}], "flags": [None, True]}
+
+@pytest.mark.parametrize("compression", [None, "gzip", "zstd"])
+@pytest.mark.parametrize("fmt", ["json", "msgpack", "cbor"])
+def test_roundtrip_every_format_and_compression(gateway_url, fmt, compression):
+    seen.clear()
+    out = InnerIClient(gateway_url, wire_format=fmt, compression=compression)._request("POST", "/echo", BODY)
+    assert out == {"body": BODY, "content_encoding": compression}
+    assert seen == [(wire.MEDIA_TYPES[fmt], compression)]
+
+def test_falls_back_to_json_when_gateway_lacks_format(gateway_url, monkeypatch):
+    # The client offers "application/json;q=0.5"; a gateway without msgpack answers in JSON.
+    monkeypatch.setattr(gateway_wire, "msgpack", None)
+    seen.clear()
+    out = InnerIClient(gateway_url, wire_format="msgpack", compression="gzip")._request("GET", "/status")
+    assert out["ok"] is True
+    assert seen == [("application/json", "gzip")]
+
+@pytest.mark.parametrize("module,fmt,compression", [
+    ("msgpack", "msgpack", None),
+    ("cbor2", "cbor", None),
+    ("zstandard", "json", "zstd"),
+])
+def test_require_raises_when_codec_missing(monkeypatch, module, fmt, compression):
+    monkeypatch.setattr(wire, module, None)
+    with pytest.raises(RuntimeError, match=r"inneri\[wire\]"):
+        wire.require(fmt, compression)
+    with pytest.raises(RuntimeError):
+        InnerIClient("http://gateway", wire_format=fmt, compression=compression)
+
+def test_require_rejects_unknown_format_and_encoding():
+    wire.require("json", "gzip")
+    with pytest.raises(ValueError):
+        wire.require("xml")
+    with pytest.raises(ValueError):
+        wire.require("json", "br")
+
+def test_zstd_body_with_several_frames():
+    frames = wire.compress(b'{"a":', "zstd") + wire.compress(b"1}", "zstd")
+    assert wire.decode(wire.decompress(frames, "zstd"), "json") == {"a": 1}